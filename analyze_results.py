@@ -5,11 +5,16 @@ AIEM結果分析・可視化スクリプト
 """
 
 import pandas as pd
-import matplotlib.pyplot as plt
 import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+import json
+import os
 
 # 日本語フォント設定
 matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans']
@@ -20,6 +25,87 @@ OUTPUT_DIR = Path("outputs")
 REPORT_DIR = OUTPUT_DIR / "reports"
 REPORT_DIR.mkdir(parents=True, exist_ok=True)
 
+# シナリオ統計のキャッシュ（pathをキーとし、mtimeが一致する場合のみ使用）
+STATS_CACHE_PATH = OUTPUT_DIR / ".stats_cache.json"
+
+
+def load_stats_cache():
+    """統計キャッシュを読み込む（存在しない・壊れている場合は空）"""
+    try:
+        with open(STATS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # 旧形式（"path:mtime"キー）のエントリは読み捨てる
+    return {
+        path: entry for path, entry in cache.items()
+        if isinstance(entry, dict) and 'mtime' in entry
+    }
+
+
+def save_stats_cache():
+    """統計キャッシュを一時ファイル経由で保存（失敗しても分析を続行する）"""
+    tmp_path = STATS_CACHE_PATH.with_suffix('.json.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_stats_cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, STATS_CACHE_PATH)
+    except OSError as e:
+        print(f"⚠ 統計キャッシュを書き込めません: {STATS_CACHE_PATH} ({e})")
+        tmp_path.unlink(missing_ok=True)
+
+
+_stats_cache = load_stats_cache()
+
+# 分析で使用する列（これ以外の列は読み込まない）
+ANALYSIS_COLUMNS = [
+    'ActiveOperatives',
+    'ActiveLeaders',
+    'ActiveBrokers',
+    'TotalResources',
+    'ArrestsThisStep',
+    'ReportsThisStep',
+    'NetworkDensity',
+    'AverageClustering',
+    'AverageDetectionExposure',
+]
+
+
+@lru_cache(maxsize=None)
+def read_scenario_csv(path, mtime):
+    """
+    シナリオCSVを読み込む（(path, mtime)単位でメモ化）
+    CSVより新しいParquetキャッシュがあればそちらを読み込む
+    戻り値は呼び出し間で共有されるため、変更する場合はコピーを使用する
+    """
+    cache_path = path.with_suffix('.parquet')
+    if cache_path.exists() and cache_path.stat().st_mtime >= mtime:
+        # 壊れた・読めないキャッシュはCSVから読み直して上書きする
+        try:
+            df = pd.read_parquet(cache_path)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"⚠ Parquetキャッシュを読み込めません: {cache_path} ({e})")
+        else:
+            if set(ANALYSIS_COLUMNS) <= set(df.columns):
+                return df
+
+    # インデックス列はヘッダーが空のため 'Unnamed: 0' として渡される
+    df = pd.read_csv(
+        path,
+        index_col=0,
+        usecols=lambda c: c in ANALYSIS_COLUMNS or c == 'Unnamed: 0',
+        dtype={c: np.float32 for c in ANALYSIS_COLUMNS},
+    )
+    # キャッシュは一時ファイルに書き込んでから置き換える（失敗しても分析を続行する）
+    tmp_path = cache_path.with_suffix('.parquet.tmp')
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ImportError, ValueError) as e:
+        print(f"⚠ Parquetキャッシュを書き込めません: {cache_path} ({e})")
+        tmp_path.unlink(missing_ok=True)
+    return df
+
 
 def load_scenarios():
     """全シナリオデータを読み込み"""
@@ -33,7 +119,11 @@ def load_scenarios():
     data = {}
     for name, path in scenarios.items():
         if path.exists():
-            df = pd.read_csv(path, index_col=0)
+            mtime = path.stat().st_mtime
+            # メモ化されたDataFrameを汚さないようコピーにattrsを設定
+            df = read_scenario_csv(path, mtime).copy()
+            # 統計キャッシュのキーとして読み込み元を記録
+            df.attrs['source'] = (str(path), mtime)
             data[name] = df
             print(f"✓ {name}: {len(df)} steps")
         else:
@@ -42,9 +132,26 @@ def load_scenarios():
     return data
 
 
+def plot_scenario_series(ax, data, metric, colors):
+    """全シナリオの時系列を1回のax.plot呼び出しでまとめて描画"""
+    series = {name: df[metric] for name, df in data.items() if metric in df.columns}
+    if not series:
+        return
+
+    # ステップ数が異なるシナリオはNaNで揃える
+    frame = pd.concat(series, axis=1)
+    lines = ax.plot(frame.index, frame.to_numpy(), linewidth=2, alpha=0.8)
+    for line, scenario_name in zip(lines, frame.columns):
+        line.set_label(scenario_name)
+        line.set_color(colors[scenario_name])
+
+
 def create_comparison_plots(data):
     """比較グラフを作成"""
-    fig, axes = plt.subplots(3, 2, figsize=(15, 12))
+    # pyplotを介さずAggキャンバスに直接描画
+    fig = Figure(figsize=(15, 12))
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(3, 2)
     fig.suptitle('Policy Intervention Comparison - AIEM Simulation Results',
                  fontsize=16, fontweight='bold')
 
@@ -66,12 +173,7 @@ def create_comparison_plots(data):
     }
 
     for metric, title, ax in plots:
-        for scenario_name, df in data.items():
-            if metric in df.columns:
-                ax.plot(df.index, df[metric],
-                       label=scenario_name,
-                       color=colors[scenario_name],
-                       linewidth=2, alpha=0.8)
+        plot_scenario_series(ax, data, metric, colors)
 
         ax.set_xlabel('Step')
         ax.set_ylabel(metric)
@@ -79,12 +181,12 @@ def create_comparison_plots(data):
         ax.legend(loc='best', fontsize=8)
         ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # 保存
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_path = REPORT_DIR / f"comparison_plots_{timestamp}.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    canvas.print_figure(output_path, dpi=300, bbox_inches='tight')
     print(f"\n📊 比較グラフ保存: {output_path}")
 
     return output_path
@@ -92,7 +194,9 @@ def create_comparison_plots(data):
 
 def create_network_analysis(data):
     """ネットワーク指標の分析グラフ"""
-    fig, axes = plt.subplots(1, 2, figsize=(15, 5))
+    fig = Figure(figsize=(15, 5))
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(1, 2)
     fig.suptitle('Network Structure Analysis', fontsize=16, fontweight='bold')
 
     colors = {
@@ -104,11 +208,7 @@ def create_network_analysis(data):
 
     # ネットワーク密度
     ax1 = axes[0]
-    for scenario_name, df in data.items():
-        ax1.plot(df.index, df['NetworkDensity'],
-                label=scenario_name,
-                color=colors[scenario_name],
-                linewidth=2, alpha=0.8)
+    plot_scenario_series(ax1, data, 'NetworkDensity', colors)
     ax1.set_xlabel('Step')
     ax1.set_ylabel('Network Density')
     ax1.set_title('Network Density Over Time', fontweight='bold')
@@ -117,52 +217,78 @@ def create_network_analysis(data):
 
     # 平均クラスタリング係数
     ax2 = axes[1]
-    for scenario_name, df in data.items():
-        ax2.plot(df.index, df['AverageClustering'],
-                label=scenario_name,
-                color=colors[scenario_name],
-                linewidth=2, alpha=0.8)
+    plot_scenario_series(ax2, data, 'AverageClustering', colors)
     ax2.set_xlabel('Step')
     ax2.set_ylabel('Average Clustering Coefficient')
     ax2.set_title('Network Clustering Over Time', fontweight='bold')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # 保存
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_path = REPORT_DIR / f"network_analysis_{timestamp}.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    canvas.print_figure(output_path, dpi=300, bbox_inches='tight')
     print(f"📊 ネットワーク分析グラフ保存: {output_path}")
 
     return output_path
 
 
+def summarize_scenario(df):
+    """1シナリオの統計を計算（累積値・平均値は1回の集約で求める）"""
+    totals = df[['ArrestsThisStep', 'ReportsThisStep',
+                 'AverageDetectionExposure', 'NetworkDensity']].agg({
+        'ArrestsThisStep': 'sum',
+        'ReportsThisStep': 'sum',
+        'AverageDetectionExposure': 'mean',
+        'NetworkDensity': 'mean',
+    })
+    final = df[['ActiveOperatives', 'ActiveLeaders', 'ActiveBrokers']].iloc[-1]
+
+    return {
+        # 最終状態
+        'final_operatives': float(final['ActiveOperatives']),
+        'final_leaders': float(final['ActiveLeaders']),
+        'final_brokers': float(final['ActiveBrokers']),
+
+        # 累積値
+        'total_arrests': float(totals['ArrestsThisStep']),
+        'total_reports': float(totals['ReportsThisStep']),
+
+        # 平均値
+        'avg_detection_exposure': float(totals['AverageDetectionExposure']),
+        'avg_network_density': float(totals['NetworkDensity']),
+    }
+
+
 def calculate_statistics(data):
-    """統計サマリーを計算"""
+    """統計サマリーを計算（読み込み元が変わらないシナリオはキャッシュを使用）"""
     stats = {}
+    cache_updated = False
 
     for scenario_name, df in data.items():
-        stats[scenario_name] = {
-            # 最終状態
-            'final_operatives': df['ActiveOperatives'].iloc[-1],
-            'final_leaders': df['ActiveLeaders'].iloc[-1],
-            'final_brokers': df['ActiveBrokers'].iloc[-1],
-
-            # 累積値
-            'total_arrests': df['ArrestsThisStep'].sum(),
-            'total_reports': df['ReportsThisStep'].sum(),
-
-            # 平均値
-            'avg_detection_exposure': df['AverageDetectionExposure'].mean(),
-            'avg_network_density': df['NetworkDensity'].mean(),
+        source = df.attrs.get('source')
+        entry = _stats_cache.get(source[0]) if source else None
+        if entry is not None and entry.get('mtime') == source[1]:
+            summary = entry['summary']
+        else:
+            summary = summarize_scenario(df)
+            if source:
+                # 再生成されたCSVの古いエントリは上書きする
+                _stats_cache[source[0]] = {'mtime': source[1], 'summary': summary}
+                cache_updated = True
 
+        stats[scenario_name] = {
+            **summary,
             # リダクション率（Baselineとの比較）
             'operatives_reduction': None,
             'leaders_reduction': None,
         }
 
+    if cache_updated:
+        save_stats_cache()
+
     # ベースラインとの比較
     if 'Baseline' in stats:
         baseline_operatives = stats['Baseline']['final_operatives']
@@ -49,6 +49,8 @@ def run_simulation(config):
         initial_monitoring_capacity=model_params.get('initial_monitoring_capacity', 0.5),
         economic_stress_level=model_params.get('economic_stress_level', 0.5),
         seed=config['seed'],
+        parallel_agents=model_params.get('parallel_agents', 1),
+        max_steps=config['steps'],
     )
 
     # 介入スケジュール
@@ -78,7 +80,7 @@ def run_simulation(config):
 
 def save_results(model, output_path):
     """結果をCSVファイルに保存"""
-    df = model.datacollector.get_model_vars_dataframe()
+    df = model.get_model_vars_dataframe()
 
     # 出力ディレクトリ作成
     output_dir = Path(output_path).parent
@@ -0,0 +1,122 @@
+"""
+Abstract Illicit Ecology Model (AIEM) - Step Kernels
+役割ごとの一括更新カーネル（Numbaでコンパイル）
+
+各カーネルはAgentStateの配列をその場で更新する。
+乱数はモデル側で一括生成して渡す。
+境界チェックなし・GIL解放でネイティブコードにコンパイルされる。
+"""
+
+from numba import njit, prange
+
+
+# 全カーネル共通のコンパイルオプション
+KERNEL_OPTIONS = dict(cache=True, fastmath=True, nogil=True, boundscheck=False)
+
+# 各エージェントが自身の要素のみを書き込むカーネルはエージェント次元で並列化
+PARALLEL_KERNEL_OPTIONS = dict(KERNEL_OPTIONS, parallel=True)
+
+
+@njit(**PARALLEL_KERNEL_OPTIONS)
+def update_social_capital(social_capital, legitimacy, active, indptr, indices):
+    """近隣ノードの平均legitimacyに基づいて社会資本を調整"""
+    for i in prange(social_capital.size):
+        start = indptr[i]
+        end = indptr[i + 1]
+        if not active[i] or end == start:
+            continue
+        total = 0.0
+        for j in range(start, end):
+            total += legitimacy[indices[j]]
+        social_capital[i] = 0.7 * social_capital[i] + 0.3 * total / (end - start)
+
+
+# 近隣の要素に書き込むため逐次実行
+@njit(**KERNEL_OPTIONS)
+def distribute_resources(idx, resources, recipient, indptr, indices):
+    """Leaderが近隣のOperative・Brokerに資源を配分"""
+    for i in idx:
+        degree = indptr[i + 1] - indptr[i]
+        if degree == 0 or resources[i] <= 0.3:
+            continue
+        transfer = resources[i] * 0.1 / degree
+        for j in range(indptr[i], indptr[i + 1]):
+            neighbor = indices[j]
+            if recipient[neighbor]:
+                resources[neighbor] += transfer
+                resources[i] -= transfer
+
+
+@njit(**PARALLEL_KERNEL_OPTIONS)
+def step_operatives(idx, resources, risk_tolerance, economic_stress,
+                    social_capital, detection_exposure, rand):
+    """Operativeのリスク調整と抽象的活動"""
+    for k in prange(idx.size):
+        i = idx[k]
+        # 経済的ストレスがリスク許容度に影響（分岐なしのmin/select）
+        stressed = economic_stress[i] > 0.7
+        risk_tolerance[i] = min(1.0, risk_tolerance[i] + 0.05 * stressed)
+
+        # 資源が少なく、リスク許容度が高い場合、活動を行う
+        if risk_tolerance[i] > 0.5 and resources[i] < 0.3:
+            if rand[i] < social_capital[i] * (1 - detection_exposure[i]):
+                resources[i] += 0.1
+            else:
+                detection_exposure[i] = min(1.0, detection_exposure[i] + 0.1)
+
+
+@njit(**PARALLEL_KERNEL_OPTIONS)
+def maintain_legitimacy(idx, resources, legitimacy, detection_exposure):
+    """Facilitatorが資源を使って合法性を高める"""
+    for k in prange(idx.size):
+        i = idx[k]
+        if resources[i] > 0.2:
+            resources[i] -= 0.05
+            legitimacy[i] = min(1.0, legitimacy[i] + 0.05)
+            detection_exposure[i] = max(0.0, detection_exposure[i] - 0.05)
+
+
+# 近隣の要素に書き込むため逐次実行
+@njit(**KERNEL_OPTIONS)
+def consider_reporting(idx, reporting_propensity, detection_exposure,
+                       indptr, indices, rand):
+    """CommunityMemberが高露出の近隣を通報し、通報件数を返す"""
+    n_reports = 0
+    for i in idx:
+        threshold = reporting_propensity[i] * 0.1
+        for j in range(indptr[i], indptr[i + 1]):
+            neighbor = indices[j]
+            if detection_exposure[neighbor] > 0.7 and rand[j] < threshold:
+                detection_exposure[neighbor] = min(
+                    1.0, detection_exposure[neighbor] + 0.2
+                )
+                n_reports += 1
+    return n_reports
+
+
+@njit(**PARALLEL_KERNEL_OPTIONS)
+def detect_targets(targets, detection_exposure, monitoring_capacity, rand, hits):
+    """Authorityの検出判定（検出確率は露出度と監視能力に依存）"""
+    for k in prange(targets.size):
+        i = targets[k]
+        hits[k] = rand[i] < detection_exposure[i] * monitoring_capacity * 0.05
+
+
+@njit(**KERNEL_OPTIONS)
+def step_reduce(role_code, active, resources, detection_exposure, active_counts):
+    """
+    ステップ末尾の集計を1パスで行う
+    役割別アクティブ数をactive_countsに書き込み、
+    (資源総量, アクティブなエージェントの露出度合計, アクティブ数) を返す
+    """
+    active_counts[:] = 0
+    total_resources = 0.0
+    exposure_sum = 0.0
+    n_active = 0
+    for i in range(role_code.size):
+        total_resources += resources[i]
+        if active[i]:
+            active_counts[role_code[i]] += 1
+            exposure_sum += detection_exposure[i]
+            n_active += 1
+    return total_resources, exposure_sum, n_active
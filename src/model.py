@@ -3,13 +3,46 @@ Abstract Illicit Ecology Model (AIEM) - Model Class
 学術研究・政策評価用の抽象化されたシミュレーションモデル
 """
 
+import warnings
+
 from mesa import Model
-from mesa import DataCollector
 import networkx as nx
 import numpy as np
-import random
+import pandas as pd
+import scipy.sparse as sp
+import numba
+import joblib
 
 from .agents import Leader, Operative, Broker, Facilitator, CommunityMember, Authority
+from .state import (
+    AgentState, Role, ROLE_NAMES,
+    ILLICIT_ROLE_CODES, RECIPIENT_ROLE_CODES, RAND_ACTIVITY,
+)
+from . import _kernels
+
+
+# 各ステップで記録するモデル変数とその型（出力CSVの列順）
+STEP_STAT_DTYPES = {
+    "ActiveLeaders": np.int32,
+    "ActiveOperatives": np.int32,
+    "ActiveBrokers": np.int32,
+    "ActiveFacilitators": np.int32,
+    "TotalResources": np.float64,
+    "AverageDetectionExposure": np.float64,
+    "ArrestsThisStep": np.int32,
+    "ReportsThisStep": np.int32,
+    "NetworkDensity": np.float64,
+    "AverageClustering": np.float64,
+}
+
+# max_steps未指定時の記録バッファの初期長
+DEFAULT_HISTORY_LENGTH = 256
+
+# run_replicationsが各実行に設定するため、param_gridで指定できないパラメータ
+REPLICATION_RESERVED_PARAMS = frozenset({"seed", "max_steps"})
+
+# 役割に対応するエージェントクラス（Roleの値で索引）
+AGENT_CLASSES = (Leader, Operative, Broker, Facilitator, CommunityMember, Authority)
 
 
 class AIEMModel(Model):
@@ -31,11 +64,26 @@ class AIEMModel(Model):
         initial_monitoring_capacity=0.5,
         economic_stress_level=0.5,
         seed=None,
+        parallel_agents=1,
+        max_steps=None,
     ):
-        super().__init__()
-        if seed is not None:
-            self.random.seed(seed)
-            np.random.seed(seed)
+        super().__init__(seed=seed)
+        # 乱数はモデルが保持するGeneratorのみを使用し、グローバルな乱数状態には触れない
+        # （Mesa側のModel.rngはバージョンに依存するため使用しない）
+        self._np_rng = np.random.default_rng(seed)
+
+        # カーネル実行のスレッド数（1で逐次実行、Numbaのスレッド数が上限）
+        if parallel_agents < 1:
+            raise ValueError("parallel_agents must be >= 1")
+        max_threads = numba.config.NUMBA_NUM_THREADS
+        if parallel_agents > max_threads:
+            warnings.warn(
+                f"parallel_agents={parallel_agents} exceeds NUMBA_NUM_THREADS="
+                f"{max_threads}; using {max_threads} threads",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        self.parallel_agents = min(parallel_agents, max_threads)
 
         # パラメータ
         self.n_leaders = n_leaders
@@ -57,6 +105,28 @@ class AIEMModel(Model):
         self.network = nx.watts_strogatz_graph(
             n=total_agents, k=network_k, p=network_p, seed=seed
         )
+        # 隣接行列（int32インデックスのCSR）は初回参照時に構築し、
+        # 以降はノード除去時に該当エントリのみ削除する
+        self._neighbor_index_dirty = True
+
+        # ネットワーク指標のキャッシュ（トポロジー変更時にのみ再計算）
+        self._graph_dirty = True
+        # 密度計算用のノード数・エッジ数（ノード除去時に差分更新）
+        self._n_nodes = self.network.number_of_nodes()
+        self._n_edges = self.network.number_of_edges()
+
+        # エージェント状態配列（unique_idで索引）
+        self.state = AgentState(total_agents)
+        role_code = np.repeat(
+            np.arange(len(Role)),
+            [n_leaders, n_operatives, n_brokers,
+             n_facilitators, n_community_members, n_authorities],
+        )
+        self.state.initialize(role_code, self._np_rng)
+        # specialty_vector: 全エージェント分を一括生成（各エージェントは行ビューを参照）
+        self._specialty = self._np_rng.dirichlet(
+            np.ones(3), size=total_agents
+        ).astype(np.float32)
 
         # 統計追跡
         self.arrests_this_step = 0
@@ -66,82 +136,139 @@ class AIEMModel(Model):
         # エージェント作成
         self._create_agents()
 
-        # データ収集
-        self.datacollector = DataCollector(
-            model_reporters={
-                "ActiveLeaders": lambda m: self.count_active_by_role("Leader"),
-                "ActiveOperatives": lambda m: self.count_active_by_role("Operative"),
-                "ActiveBrokers": lambda m: self.count_active_by_role("Broker"),
-                "ActiveFacilitators": lambda m: self.count_active_by_role("Facilitator"),
-                "TotalResources": lambda m: self.total_resources(),
-                "AverageDetectionExposure": lambda m: self.average_detection_exposure(),
-                "ArrestsThisStep": lambda m: m.arrests_this_step,
-                "ReportsThisStep": lambda m: m.reports_this_step,
-                "NetworkDensity": lambda m: nx.density(m.network),
-                "AverageClustering": lambda m: nx.average_clustering(m.network),
-            }
-        )
+        # 乱数プール: 各Authorityに検出判定用の列を割り当てる
+        authority_ids = self.role_indices[Role.AUTHORITY]
+        self._rand_slot = np.zeros(total_agents, dtype=np.int32)
+        self._rand_slot[authority_ids] = RAND_ACTIVITY + 1 + np.arange(authority_ids.size)
+        self._rand_slots = RAND_ACTIVITY + 1 + authority_ids.size
+
+        # データ収集: モデル変数ごとの列バッファに各ステップの値を書き込む
+        # （max_steps未指定または超過時はバッファを倍に拡張）
+        history_length = max_steps or DEFAULT_HISTORY_LENGTH
+        self._hist = {
+            key: np.empty(history_length, dtype=dtype)
+            for key, dtype in STEP_STAT_DTYPES.items()
+        }
+        self._step_i = 0
+        # 集計カーネルが書き込む役割別アクティブ数
+        self._active_counts = np.zeros(len(Role), dtype=np.int64)
 
         self.running = True
 
+    @classmethod
+    def run_replications(cls, param_grid, seeds, n_steps, n_jobs=-1):
+        """
+        パラメータ組とシードの全組み合わせを並列に実行
+        各実行のモデル変数DataFrameを param_grid × seeds の順で返す
+        政策介入は適用されない（各実行は介入なしでn_stepsだけ進める）
+        seedとmax_stepsは引数から設定されるため、param_gridには指定できない
+        """
+        # 各パラメータ組で同じシード列を使うため、イテレータも先にリスト化する
+        param_grid = list(param_grid)
+        seeds = list(seeds)
+        for params in param_grid:
+            reserved = REPLICATION_RESERVED_PARAMS.intersection(params)
+            if reserved:
+                raise ValueError(
+                    f"param_grid entries must not set {sorted(reserved)}"
+                )
+        return joblib.Parallel(n_jobs=n_jobs, backend="loky")(
+            joblib.delayed(cls._run_one)(params, seed, n_steps)
+            for params in param_grid
+            for seed in seeds
+        )
+
+    @classmethod
+    def _run_one(cls, params, seed, n_steps):
+        """1回分のシミュレーションを実行してモデル変数を返す"""
+        model = cls(**params, seed=seed, max_steps=n_steps)
+        for _ in range(n_steps):
+            model.step()
+        return model.get_model_vars_dataframe()
+
     def _create_agents(self):
         """エージェントを作成してネットワークに配置"""
-        agent_id = 0
-
-        # Leaders
-        for _ in range(self.n_leaders):
-            agent = Leader(agent_id, self)
-            agent_id += 1
-
-        # Operatives
-        for _ in range(self.n_operatives):
-            agent = Operative(agent_id, self)
-            agent.economic_stress = self.economic_stress_level
-            agent_id += 1
-
-        # Brokers
-        for _ in range(self.n_brokers):
-            agent = Broker(agent_id, self)
-            agent_id += 1
-
-        # Facilitators
-        for _ in range(self.n_facilitators):
-            agent = Facilitator(agent_id, self)
-            agent_id += 1
-
-        # Community Members
-        for _ in range(self.n_community_members):
-            agent = CommunityMember(agent_id, self)
-            agent_id += 1
-
-        # Authorities
-        for _ in range(self.n_authorities):
-            agent = Authority(agent_id, self)
-            agent.monitoring_capacity = self.initial_monitoring_capacity
-            agent_id += 1
+        state = self.state
+
+        # 役割ごとのエージェントID（役割は変化しないため作成時に一度だけ構築）
+        # 役割別の索引はすべてRoleの値で索引するリスト・配列として保持する
+        role_code = state.role_code
+        self.role_indices = [np.flatnonzero(role_code == role) for role in Role]
+
+        # 環境パラメータを役割単位で一括設定
+        state.economic_stress[self.role_indices[Role.OPERATIVE]] = self.economic_stress_level
+        state.monitoring_capacity[self.role_indices[Role.AUTHORITY]] = (
+            self.initial_monitoring_capacity
+        )
+
+        # エージェントは状態配列へのハンドルとしてのみ生成
+        # unique_idからエージェントへの索引（非アクティブ化後も保持）
+        self._agents_by_id = {}
+        for role in Role:
+            agent_class = AGENT_CLASSES[role]
+            for agent_id in self.role_indices[role].tolist():
+                self._agents_by_id[agent_id] = agent_class(agent_id, self)
+
+        self._role_mask = role_code == np.arange(len(Role))[:, None]
+        self._illicit_indices = np.flatnonzero(np.isin(role_code, ILLICIT_ROLE_CODES))
+        # アクティブなLeader・Operative・Brokerの総数（非アクティブ化時に減算）
+        self._active_illicit_count = self._illicit_indices.size
+        self._recipient_mask = np.isin(role_code, RECIPIENT_ROLE_CODES)
+
+    def _build_neighbor_index(self):
+        """ネットワークからCSR形式の隣接行列と近隣インデックスを構築"""
+        n = self.state.n_agents
+        edges = np.array(self.network.edges(), dtype=np.int32).reshape(-1, 2)
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+
+        # 除去済みノードの行は空になる
+        self._adjacency = sp.csr_array(
+            (np.ones(rows.size, dtype=np.int8), (rows, cols)), shape=(n, n)
+        )
+        self._adjacency.sort_indices()
+        self._neighbor_indptr = self._adjacency.indptr
+        self._neighbor_indices = self._adjacency.indices
+        self.neighbor_degree = np.diff(self._neighbor_indptr)
+        self._neighbor_index_dirty = False
+
+    def _ensure_neighbor_index(self):
+        """近隣インデックスが古ければ再構築"""
+        if self._neighbor_index_dirty:
+            self._build_neighbor_index()
+
+    def neighbors(self, agent_id):
+        """近隣エージェントのID配列を返す（コピーなしのビュー）"""
+        self._ensure_neighbor_index()
+        start = self._neighbor_indptr[agent_id]
+        end = self._neighbor_indptr[agent_id + 1]
+        return self._neighbor_indices[start:end]
 
     def get_agent_by_id(self, agent_id):
         """IDによってエージェントを取得"""
-        for agent in self.agents:
-            if agent.unique_id == agent_id:
-                return agent
-        return None
+        return self._agents_by_id.get(agent_id)
 
     def count_active_by_role(self, role):
-        """特定の役割のアクティブなエージェント数を数える"""
-        return sum(1 for agent in self.agents
-                   if agent.role == role and agent.active)
+        """
+        特定の役割のアクティブなエージェント数を数える
+        roleはRoleまたは表示名（"Leader"など）で指定する
+        """
+        if isinstance(role, str):
+            if role not in ROLE_NAMES:
+                raise ValueError(f"unknown role: {role!r}")
+            role = ROLE_NAMES.index(role)
+        return int(np.count_nonzero(self.state.active[self.role_indices[role]]))
 
     def total_resources(self):
         """全エージェントの資源総量"""
-        return sum(agent.resources for agent in self.agents
-                   if hasattr(agent, 'resources'))
+        return float(self.state.resources.sum(dtype=np.float64))
 
     def average_detection_exposure(self):
-        """平均検出露出度"""
-        exposures = [agent.detection_exposure for agent in self.agents
-                     if hasattr(agent, 'detection_exposure') and agent.active]
-        return np.mean(exposures) if exposures else 0.0
+        """平均検出露出度（アクティブなエージェントのみ）"""
+        active = self.state.active.view(bool)
+        if not active.any():
+            return 0.0
+        return float(self.state.detection_exposure[active].mean(dtype=np.float64))
 
     def intervene_agent(self, agent_id):
         """エージェントに介入（抽象化された逮捕）"""
@@ -153,9 +280,134 @@ class AIEMModel(Model):
             # 複数回の逮捕でネットワークから除外
             if agent.arrest_count >= 2:
                 agent.active = False
+                if agent.role in ILLICIT_ROLE_CODES:
+                    self._active_illicit_count -= 1
                 # ネットワークから除去
-                if agent.unique_id in self.network:
-                    self.network.remove_node(agent.unique_id)
+                self._remove_from_network(agent.unique_id)
+
+    def _remove_from_network(self, agent_id):
+        """ノードを除去し、トポロジー依存のキャッシュを無効化"""
+        try:
+            degree = self.network.degree(agent_id)
+            self.network.remove_node(agent_id)
+        except nx.NetworkXError:
+            # 既に除去済み
+            return
+        self._n_nodes -= 1
+        self._n_edges -= degree
+        self._drop_from_neighbor_index(agent_id)
+        self._graph_dirty = True
+
+    def _drop_from_neighbor_index(self, agent_id):
+        """
+        除去されたノードの行と、各近隣行中の当該エントリのみを隣接行列から削除
+        削除位置は影響する行の範囲内だけで求め、残りの配列は詰め直すのみとする
+        """
+        if self._neighbor_index_dirty:
+            # 未構築なら次回参照時に現在のネットワークから構築される
+            return
+        adjacency = self._adjacency
+        indptr = adjacency.indptr
+        indices = adjacency.indices
+        start, end = indptr[agent_id], indptr[agent_id + 1]
+        neighbors = indices[start:end].copy()
+
+        # 近隣行は列インデックスがソート済みのため二分探索で位置を求める
+        positions = np.empty(neighbors.size + (end - start), dtype=np.int64)
+        for k, neighbor in enumerate(neighbors.tolist()):
+            row_start, row_end = indptr[neighbor], indptr[neighbor + 1]
+            positions[k] = row_start + np.searchsorted(
+                indices[row_start:row_end], agent_id
+            )
+        positions[neighbors.size:] = np.arange(start, end)
+
+        # 各行の削除数だけindptrを後方へずらす
+        removed = np.zeros(indptr.size, dtype=indptr.dtype)
+        removed[neighbors + 1] = 1
+        removed[agent_id + 1] = end - start
+        adjacency.indptr = indptr - np.cumsum(removed, dtype=indptr.dtype)
+        adjacency.indices = np.delete(indices, positions)
+        adjacency.data = np.delete(adjacency.data, positions)
+
+        self._neighbor_indptr = adjacency.indptr
+        self._neighbor_indices = adjacency.indices
+        self.neighbor_degree[neighbors] -= 1
+        self.neighbor_degree[agent_id] = 0
+
+    def _refresh_network_metrics(self):
+        """隣接行列から平均クラスタリング係数を再計算"""
+        self._ensure_neighbor_index()
+        adjacency = self._adjacency.astype(np.int32)
+        n_nodes = self._n_nodes
+
+        # ノードiの閉じた2-パス数 ((A@A)∘A の行和) は三角形数の2倍
+        closed = np.asarray((adjacency @ adjacency).multiply(adjacency).sum(axis=1)).ravel()
+        degree = self.neighbor_degree.astype(np.float64)
+        possible = degree * (degree - 1)
+        clustering = np.divide(
+            closed, possible, out=np.zeros_like(possible), where=possible > 0
+        )
+        # 除去済みノードはクラスタリング係数0で平均の分母にも含めない
+        self._cached_clustering = clustering.sum() / n_nodes if n_nodes > 0 else 0.0
+        self._graph_dirty = False
+
+    def network_density(self):
+        """
+        ネットワーク密度（nx.densityと同値）
+        差分更新されるノード数・エッジ数から定数時間で計算される
+        """
+        n_nodes = self._n_nodes
+        if n_nodes <= 1:
+            return 0.0
+        return 2 * self._n_edges / (n_nodes * (n_nodes - 1))
+
+    def average_clustering(self):
+        """
+        平均クラスタリング係数（nx.average_clusteringと同値）
+        疎行列演算で計算し、トポロジー変更後の最初の呼び出しでのみ再計算される
+        """
+        if self._graph_dirty:
+            self._refresh_network_metrics()
+        return self._cached_clustering
+
+    def _compute_step_stats(self):
+        """記録するモデル変数をまとめて計算（状態配列の集計は1パスのカーネルで行う）"""
+        state = self.state
+        counts = self._active_counts
+        total_resources, exposure_sum, n_active = _kernels.step_reduce(
+            state.role_code, state.active, state.resources,
+            state.detection_exposure, counts,
+        )
+        return {
+            "ActiveLeaders": counts[Role.LEADER],
+            "ActiveOperatives": counts[Role.OPERATIVE],
+            "ActiveBrokers": counts[Role.BROKER],
+            "ActiveFacilitators": counts[Role.FACILITATOR],
+            "TotalResources": total_resources,
+            "AverageDetectionExposure": exposure_sum / n_active if n_active else 0.0,
+            "ArrestsThisStep": self.arrests_this_step,
+            "ReportsThisStep": self.reports_this_step,
+            "NetworkDensity": self.network_density(),
+            "AverageClustering": self.average_clustering(),
+        }
+
+    def _record_step_stats(self):
+        """現ステップのモデル変数を記録バッファに書き込む"""
+        i = self._step_i
+        for key, value in self._compute_step_stats().items():
+            column = self._hist[key]
+            if i == column.size:
+                column = self._hist[key] = np.concatenate(
+                    [column, np.empty_like(column)]
+                )
+            column[i] = value
+        self._step_i = i + 1
+
+    def get_model_vars_dataframe(self):
+        """記録済みのモデル変数をステップ順のDataFrameとして返す"""
+        return pd.DataFrame(
+            {key: column[:self._step_i] for key, column in self._hist.items()}
+        )
 
     def report_suspicious_activity(self, target_agent_id):
         """疑わしい活動の通報"""
@@ -170,29 +422,133 @@ class AIEMModel(Model):
         政策介入を適用
         intervention_type: 'monitoring', 'economic_support', 'community_engagement'
         """
+        state = self.state
+
         if intervention_type == 'monitoring':
             # 監視強化
-            for agent in self.agents:
-                if agent.role == "Authority":
-                    agent.monitoring_capacity = min(1.0,
-                        agent.monitoring_capacity + intensity * 0.3)
+            m = self._role_mask[Role.AUTHORITY]
+            state.monitoring_capacity[m] = np.minimum(
+                1.0, state.monitoring_capacity[m] + intensity * 0.3
+            )
 
         elif intervention_type == 'economic_support':
             # 経済支援（コミュニティメンバーとOperativeのストレス軽減）
-            for agent in self.agents:
-                if agent.role in ["Operative", "CommunityMember"]:
-                    if hasattr(agent, 'economic_stress'):
-                        agent.economic_stress = max(0.0,
-                            agent.economic_stress - intensity * 0.3)
-                    if hasattr(agent, 'resources'):
-                        agent.resources += intensity * 0.2
+            m = self._role_mask[Role.OPERATIVE]
+            state.economic_stress[m] = np.maximum(
+                0.0, state.economic_stress[m] - intensity * 0.3
+            )
+            m = m | self._role_mask[Role.COMMUNITY]
+            state.resources[m] += intensity * 0.2
 
         elif intervention_type == 'community_engagement':
             # コミュニティ関与強化（通報傾向の向上）
-            for agent in self.agents:
-                if agent.role == "CommunityMember":
-                    agent.reporting_propensity = min(1.0,
-                        agent.reporting_propensity + intensity * 0.2)
+            m = self._role_mask[Role.COMMUNITY]
+            state.reporting_propensity[m] = np.minimum(
+                1.0, state.reporting_propensity[m] + intensity * 0.2
+            )
+
+    def _draw_random_pool(self):
+        """1ステップ分の乱数を一括生成"""
+        self._ensure_neighbor_index()
+        self._randpool = self._np_rng.random(
+            (self.state.n_agents, self._rand_slots), dtype=np.float32
+        )
+        # CommunityMemberの通報判定用（近隣インデックスのエッジごとに1つ）
+        self._edge_randpool = self._np_rng.random(
+            self._neighbor_indices.size, dtype=np.float32
+        )
+
+    def _active_indices(self, role):
+        """特定の役割のアクティブなエージェントIDの配列"""
+        idx = self.role_indices[role]
+        return idx[self.state.active.view(bool)[idx]]
+
+    def step_common(self):
+        """全役割共通の更新（社会資本・リスク許容度）を一括実行"""
+        state = self.state
+        self._ensure_neighbor_index()
+        _kernels.update_social_capital(
+            state.social_capital, state.legitimacy, state.active,
+            self._neighbor_indptr, self._neighbor_indices,
+        )
+
+        # 逮捕率が高い場合、リスク許容度を下げる（学習）
+        if self.recent_arrest_rate > 0.1:
+            state.risk_tolerance[state.active.view(bool)] *= 0.95
+
+    def step_leaders(self):
+        """
+        Leaderの資源配分を一括実行
+        Leaderは受け手にならず自身の資源のみで配分量が決まるため、処理順序は結果に影響しない
+        """
+        _kernels.distribute_resources(
+            self._active_indices(Role.LEADER), self.state.resources,
+            self._recipient_mask,
+            self._neighbor_indptr, self._neighbor_indices,
+        )
+
+    def step_operatives(self):
+        """Operativeのリスク調整と抽象的活動を一括実行"""
+        state = self.state
+        idx = self._active_indices(Role.OPERATIVE)
+        _kernels.step_operatives(
+            idx, state.resources, state.risk_tolerance, state.economic_stress,
+            state.social_capital, state.detection_exposure,
+            self._randpool[:, RAND_ACTIVITY],
+        )
+
+    def step_brokers(self):
+        """Brokerの仲介による利益を一括実行（ネットワーク位置の価値）"""
+        idx = self._active_indices(Role.BROKER)
+        degree = self.neighbor_degree[idx].astype(np.float32)
+        self.state.resources[idx] += np.where(
+            degree >= 2, degree * np.float32(0.02), np.float32(0.0)
+        )
+
+    def step_facilitators(self):
+        """Facilitatorの合法性維持を一括実行"""
+        state = self.state
+        _kernels.maintain_legitimacy(
+            self._active_indices(Role.FACILITATOR), state.resources,
+            state.legitimacy, state.detection_exposure,
+        )
+
+    def step_community(self):
+        """
+        CommunityMemberの通報行動を一括実行
+        通報は露出度が0.7を超える近隣をさらに上げるのみで、乱数はエッジ単位のため処理順序は結果に影響しない
+        """
+        state = self.state
+        self.reports_this_step += _kernels.consider_reporting(
+            self._active_indices(Role.COMMUNITY),
+            state.reporting_propensity, state.detection_exposure,
+            self._neighbor_indptr, self._neighbor_indices,
+            self._edge_randpool,
+        )
+
+    def step_authorities(self):
+        """Authorityの監視と介入を実行（各Authority内で一括判定）"""
+        state = self.state
+        illicit = self._illicit_indices
+
+        authorities = self._active_indices(Role.AUTHORITY)
+
+        for authority_id in authorities:
+            # 監視対象はアクティブなLeader・Operative・Broker
+            targets = illicit[state.active.view(bool)[illicit]]
+            hits = np.empty(targets.size, dtype=bool)
+            _kernels.detect_targets(
+                targets, state.detection_exposure,
+                state.monitoring_capacity[authority_id],
+                self._randpool[:, self._rand_slot[authority_id]], hits,
+            )
+            for agent_id in targets[hits]:
+                self.intervene_agent(int(agent_id))
+                state.intervention_resources[authority_id] -= 0.1
+
+        # 資源の回復（全Authorityを一括でクランプ）
+        recovered = state.intervention_resources[authorities] + np.float32(0.05)
+        state.intervention_resources[authorities] = np.minimum(recovered, 1.0)
 
     def step(self):
         """1タイムステップを実行"""
@@ -200,23 +556,32 @@ class AIEMModel(Model):
         self.arrests_this_step = 0
         self.reports_this_step = 0
 
-        # エージェントのステップ実行（ランダムな順序）
-        agent_list = list(self.agents)
-        random.shuffle(agent_list)
-        for agent in agent_list:
-            agent.step()
+        # 役割ごとの一括カーネルでエージェントの行動を実行
+        # （エージェントごとのstep呼び出し・スケジューラは使用しない）
+        # Numbaのスレッド数はカーネル実行中のみ変更し、終了後に元の値へ戻す
+        previous_threads = numba.get_num_threads()
+        numba.set_num_threads(self.parallel_agents)
+        try:
+            self._draw_random_pool()
+            self.step_common()
+            self.step_leaders()
+            self.step_operatives()
+            self.step_brokers()
+            self.step_facilitators()
+            self.step_community()
+            self.step_authorities()
+        finally:
+            numba.set_num_threads(previous_threads)
 
         # 逮捕率の更新
-        active_illicit = self.count_active_by_role("Leader") + \
-                        self.count_active_by_role("Operative") + \
-                        self.count_active_by_role("Broker")
+        active_illicit = self._active_illicit_count
         if active_illicit > 0:
             self.recent_arrest_rate = self.arrests_this_step / active_illicit
         else:
             self.recent_arrest_rate = 0.0
 
         # データ収集
-        self.datacollector.collect(self)
+        self._record_step_stats()
 
         # 停止条件のチェック（オプション）
         if active_illicit == 0:
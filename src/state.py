@@ -0,0 +1,132 @@
+"""
+Abstract Illicit Ecology Model (AIEM) - Agent State Arrays
+エージェント状態のStruct-of-Arrays（SoA）表現
+"""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class Role(IntEnum):
+    """エージェントの役割（role_code配列に格納される値）"""
+
+    LEADER = 0
+    OPERATIVE = 1
+    BROKER = 2
+    FACILITATOR = 3
+    COMMUNITY = 4
+    AUTHORITY = 5
+
+
+# 役割の表示名（Roleの値で索引）
+ROLE_NAMES = (
+    "Leader",
+    "Operative",
+    "Broker",
+    "Facilitator",
+    "CommunityMember",
+    "Authority",
+)
+
+# 監視・介入の対象となる役割（Leader, Operative, Broker）
+ILLICIT_ROLE_CODES = (Role.LEADER, Role.OPERATIVE, Role.BROKER)
+
+# Leaderの資源配分を受け取る役割
+RECIPIENT_ROLE_CODES = (Role.OPERATIVE, Role.BROKER)
+
+# 乱数プール（model._randpool）の列: 0は活動判定、1以降は各Authorityの検出判定
+RAND_ACTIVITY = 0
+
+# 初期属性の一様分布の範囲（仕様書セクション5より）
+INITIAL_RANGES = {
+    "resources": (0.1, 1.0),
+    "legitimacy": (0.0, 1.0),
+    "risk_tolerance": (0.0, 1.0),
+    "social_capital": (0.0, 1.0),
+    "detection_exposure": (0.0, 1.0),
+}
+
+# 役割ごとの初期範囲の上書き（役割固有の属性を含む）
+ROLE_INITIAL_RANGES = {
+    # Leaderは比較的高い資源と社会資本を持ち、露出は比較的低い
+    Role.LEADER: {
+        "resources": (0.5, 1.0),
+        "social_capital": (0.4, 1.0),
+        "detection_exposure": (0.1, 0.5),
+    },
+    Role.OPERATIVE: {
+        "economic_stress": (0.0, 1.0),
+    },
+    # Brokerは高い社会資本を持つ
+    Role.BROKER: {
+        "social_capital": (0.5, 1.0),
+    },
+    # Facilitatorは高いlegitimacyと低い露出を持つ
+    Role.FACILITATOR: {
+        "legitimacy": (0.5, 1.0),
+        "detection_exposure": (0.0, 0.3),
+    },
+    # 一般市民は通常高いlegitimacyを持つ
+    Role.COMMUNITY: {
+        "legitimacy": (0.7, 1.0),
+        "vulnerability": (0.0, 1.0),
+        "reporting_propensity": (0.0, 1.0),
+    },
+    Role.AUTHORITY: {
+        "monitoring_capacity": (0.5, 0.5),
+        "intervention_resources": (1.0, 1.0),
+    },
+}
+
+
+class AgentState:
+    """
+    unique_idで索引されるエージェント状態配列
+    各エージェントはプロパティ経由でこの配列を読み書きする
+    属性値は[0, 1]程度の範囲に収まるためfloat32で保持する
+    （0.05刻みの増減や0.95倍の減衰を繰り返すため、uint8固定小数点では丸めで値が停滞する）
+    """
+
+    def __init__(self, n_agents):
+        self.n_agents = n_agents
+
+        # 共通抽象属性
+        self.resources = np.zeros(n_agents, dtype=np.float32)
+        self.legitimacy = np.zeros(n_agents, dtype=np.float32)
+        self.risk_tolerance = np.zeros(n_agents, dtype=np.float32)
+        self.social_capital = np.zeros(n_agents, dtype=np.float32)
+        self.detection_exposure = np.zeros(n_agents, dtype=np.float32)
+
+        # 役割固有の属性（該当しない役割では未使用）
+        self.economic_stress = np.zeros(n_agents, dtype=np.float32)
+        self.vulnerability = np.zeros(n_agents, dtype=np.float32)
+        self.reporting_propensity = np.zeros(n_agents, dtype=np.float32)
+        self.monitoring_capacity = np.zeros(n_agents, dtype=np.float32)
+        self.intervention_resources = np.zeros(n_agents, dtype=np.float32)
+
+        # フラグ・コード・カウンタは小さな整数型で保持
+        self.active = np.zeros(n_agents, dtype=np.uint8)
+        self.role_code = np.zeros(n_agents, dtype=np.uint8)
+        self.arrest_count = np.zeros(n_agents, dtype=np.uint16)
+
+    def initialize(self, role_code, rng):
+        """役割コードを設定し、初期属性を属性ごとに1回の乱数生成で埋める"""
+        self.role_code[:] = role_code
+        self.active[:] = 1
+        self.arrest_count[:] = 0
+
+        fields = dict.fromkeys(INITIAL_RANGES)
+        for ranges in ROLE_INITIAL_RANGES.values():
+            fields.update(dict.fromkeys(ranges))
+
+        for field in fields:
+            low = np.zeros(self.n_agents)
+            high = np.zeros(self.n_agents)
+            if field in INITIAL_RANGES:
+                low[:], high[:] = INITIAL_RANGES[field]
+            for role, ranges in ROLE_INITIAL_RANGES.items():
+                if field in ranges:
+                    mask = self.role_code == role
+                    low[mask], high[mask] = ranges[field]
+            getattr(self, field)[:] = rng.uniform(low, high)
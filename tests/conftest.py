@@ -0,0 +1,13 @@
+"""
+テスト共通設定
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# parallel_agents>1を検証できるよう、Numbaの読み込み前にスレッド数の上限を確保する
+os.environ.setdefault("NUMBA_NUM_THREADS", "4")
+
+# リポジトリ直下をインポートパスに追加（src パッケージを参照するため）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,200 @@
+"""
+AIEMModel のテスト
+"""
+
+import networkx as nx
+import numba
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model import AIEMModel, STEP_STAT_DTYPES
+from src.state import Role, ROLE_NAMES
+
+
+def run_model(n_steps=50, **params):
+    """モデルを生成してn_stepsだけ実行"""
+    model = AIEMModel(**params)
+    for _ in range(n_steps):
+        model.step()
+    return model
+
+
+def test_network_metrics_match_networkx_after_removals():
+    """ノード除去後もネットワーク密度・クラスタリング係数がnetworkxと一致する"""
+    model = AIEMModel(seed=3, initial_monitoring_capacity=1.0)
+    total_agents = model.state.n_agents
+    for _ in range(100):
+        model.step()
+        assert model.network_density() == pytest.approx(
+            nx.density(model.network), abs=1e-12
+        )
+        assert model.average_clustering() == pytest.approx(
+            nx.average_clustering(model.network), abs=1e-12
+        )
+    # 逮捕によるノード除去が発生していること
+    assert model.network.number_of_nodes() < total_agents
+
+
+def test_neighbor_index_matches_network_after_removals():
+    """差分更新された隣接行列が現在のネットワークと一致する"""
+    model = run_model(100, seed=3, initial_monitoring_capacity=1.0)
+    for node in range(model.state.n_agents):
+        expected = sorted(model.network[node]) if node in model.network else []
+        assert model.neighbors(node).tolist() == expected
+
+
+def test_seeded_runs_are_reproducible():
+    """同じシードでは同一の結果、異なるシードでは異なる結果になる"""
+    first = run_model(seed=42).get_model_vars_dataframe()
+    second = run_model(seed=42).get_model_vars_dataframe()
+    other = run_model(seed=43).get_model_vars_dataframe()
+
+    pd.testing.assert_frame_equal(first, second)
+    assert not first.equals(other)
+
+
+@pytest.mark.skipif(
+    numba.config.NUMBA_NUM_THREADS < 2, reason="Numbaのスレッドが1つのみ"
+)
+def test_parallel_agents_matches_serial():
+    """parallel_agents>1でも逐次実行と同一の結果になる"""
+    serial = run_model(seed=7, parallel_agents=1)
+    parallel = run_model(seed=7, parallel_agents=2)
+
+    assert parallel.parallel_agents == 2
+    pd.testing.assert_frame_equal(
+        serial.get_model_vars_dataframe(), parallel.get_model_vars_dataframe()
+    )
+
+
+def test_parallel_agents_must_be_positive():
+    with pytest.raises(ValueError):
+        AIEMModel(seed=1, parallel_agents=0)
+
+
+def test_parallel_agents_is_capped_with_warning():
+    """Numbaのスレッド数を超える指定は上限に切り詰められ警告される"""
+    limit = numba.config.NUMBA_NUM_THREADS
+    with pytest.warns(RuntimeWarning):
+        model = AIEMModel(seed=1, parallel_agents=limit + 1)
+    assert model.parallel_agents == limit
+
+
+def test_step_restores_numba_thread_count():
+    """stepの実行後はNumbaのスレッド数が元に戻る"""
+    before = numba.get_num_threads()
+    run_model(1, seed=1, parallel_agents=1)
+    assert numba.get_num_threads() == before
+
+
+def test_monitoring_intervention():
+    """監視強化はAuthorityの監視能力のみを上限1.0で引き上げる"""
+    model = AIEMModel(seed=1, initial_monitoring_capacity=0.5)
+    authorities = model.role_indices[Role.AUTHORITY]
+    others = np.setdiff1d(np.arange(model.state.n_agents), authorities)
+    before = model.state.monitoring_capacity.copy()
+
+    model.apply_policy_intervention('monitoring', 0.5)
+    np.testing.assert_allclose(model.state.monitoring_capacity[authorities], 0.65)
+    np.testing.assert_array_equal(
+        model.state.monitoring_capacity[others], before[others]
+    )
+
+    model.apply_policy_intervention('monitoring', 2.0)
+    np.testing.assert_array_equal(model.state.monitoring_capacity[authorities], 1.0)
+
+
+def test_economic_support_intervention():
+    """経済支援はOperativeのストレスを下げ、Operativeと市民の資源を増やす"""
+    model = AIEMModel(seed=1, economic_stress_level=0.5)
+    state = model.state
+    operatives = model.role_indices[Role.OPERATIVE]
+    community = model.role_indices[Role.COMMUNITY]
+    leaders = model.role_indices[Role.LEADER]
+    resources = state.resources.copy()
+
+    model.apply_policy_intervention('economic_support', 0.5)
+    np.testing.assert_allclose(state.economic_stress[operatives], 0.35)
+    np.testing.assert_allclose(state.resources[operatives], resources[operatives] + 0.1)
+    np.testing.assert_allclose(state.resources[community], resources[community] + 0.1)
+    np.testing.assert_array_equal(state.resources[leaders], resources[leaders])
+
+    # ストレスは0未満にならない
+    model.apply_policy_intervention('economic_support', 5.0)
+    np.testing.assert_array_equal(state.economic_stress[operatives], 0.0)
+
+
+def test_community_engagement_intervention():
+    """コミュニティ関与は市民の通報傾向のみを上限1.0で引き上げる"""
+    model = AIEMModel(seed=1)
+    state = model.state
+    community = model.role_indices[Role.COMMUNITY]
+    before = state.reporting_propensity.copy()
+
+    model.apply_policy_intervention('community_engagement', 0.5)
+    np.testing.assert_allclose(
+        state.reporting_propensity[community],
+        np.minimum(1.0, before[community] + 0.1),
+        rtol=1e-6,
+    )
+    assert state.reporting_propensity.max() <= 1.0
+
+
+def test_unknown_intervention_is_ignored():
+    model = AIEMModel(seed=1)
+    before = {
+        name: getattr(model.state, name).copy()
+        for name in ('monitoring_capacity', 'economic_stress', 'resources',
+                     'reporting_propensity')
+    }
+    model.apply_policy_intervention('unknown', 0.5)
+    for name, values in before.items():
+        np.testing.assert_array_equal(getattr(model.state, name), values)
+
+
+@pytest.mark.parametrize("max_steps", [None, 10, 80])
+def test_model_vars_dataframe(max_steps):
+    """記録されたモデル変数のDataFrameの行数・列・型"""
+    model = run_model(60, seed=5, max_steps=max_steps)
+    df = model.get_model_vars_dataframe()
+
+    assert df.shape == (60, len(STEP_STAT_DTYPES))
+    assert list(df.columns) == list(STEP_STAT_DTYPES)
+    assert df.index.tolist() == list(range(60))
+    for column, dtype in STEP_STAT_DTYPES.items():
+        assert df[column].dtype == dtype
+
+    # 集計値は状態配列・ネットワークから求めた値と一致する
+    last = df.iloc[-1]
+    assert last['ActiveLeaders'] == model.count_active_by_role(Role.LEADER)
+    assert last['ActiveOperatives'] == model.count_active_by_role(Role.OPERATIVE)
+    assert last['TotalResources'] == pytest.approx(model.total_resources())
+    assert last['AverageDetectionExposure'] == pytest.approx(
+        model.average_detection_exposure()
+    )
+    assert last['NetworkDensity'] == pytest.approx(nx.density(model.network))
+
+
+def test_run_replications_covers_every_combination():
+    """シードがイテレータでも全パラメータ組×シードが実行される"""
+    results = AIEMModel.run_replications(
+        [{}, {'initial_monitoring_capacity': 0.9}], iter([1, 2]), 5, n_jobs=1
+    )
+    assert len(results) == 4
+    pd.testing.assert_frame_equal(results[0], AIEMModel._run_one({}, 1, 5))
+
+
+def test_count_active_by_role_accepts_role_and_display_name():
+    model = run_model(30, seed=3, initial_monitoring_capacity=1.0)
+    for role, name in zip(Role, ROLE_NAMES):
+        assert model.count_active_by_role(name) == model.count_active_by_role(role)
+        assert model.get_agent_by_id(model.role_indices[role][0]).role_name == name
+    with pytest.raises(ValueError):
+        model.count_active_by_role("Boss")
+
+
+@pytest.mark.parametrize("key", ["seed", "max_steps"])
+def test_run_replications_rejects_reserved_params(key):
+    with pytest.raises(ValueError):
+        AIEMModel.run_replications([{key: 1}], [1], 5, n_jobs=1)